@@ -0,0 +1,92 @@
+"""
+Shared helpers for the deployment scripts
+"""
+
+import asyncio
+import functools
+import json
+import shutil
+from collections import deque
+
+# Lines of output kept per stream; the rest is only echoed as it arrives
+OUTPUT_TAIL_LINES = 64
+
+# For now, a template that user can update with actual URL
+ONLINE_MCP_JSON = json.dumps({
+    "mcpServers": {
+        "interactive-feedback-mcp-online": {
+            "command": "curl",
+            "args": [
+                "-X", "POST",
+                "https://YOUR-RAILWAY-URL.up.railway.app/api/interactive-feedback",
+                "-H", "Content-Type: application/json",
+                "-d", "@-"
+            ],
+            "timeout": 600,
+            "autoApprove": [
+                "interactive_feedback"
+            ]
+        }
+    }
+}, indent=2)
+
+# Bytes read from a child stream at a time; readline() would raise on lines
+# longer than the stream limit, e.g. progress bars redrawn with \r
+READ_CHUNK_SIZE = 4096
+
+def _emit(line, tail, echo):
+    line = line.decode(errors="replace").rstrip()
+    if line:
+        if echo:
+            print(f"  {line}")
+        tail.append(line)
+
+async def _pump(stream, tail, echo=True):
+    """Echo a child stream line by line, keeping only its last lines"""
+    pending = b""
+    while chunk := await stream.read(READ_CHUNK_SIZE):
+        data = pending + chunk
+        lines = data.splitlines()
+        # Hold back a trailing partial line until the rest of it arrives
+        pending = b"" if data.endswith((b"\n", b"\r")) else lines.pop()
+        for line in lines:
+            _emit(line, tail, echo)
+    _emit(pending, tail, echo)
+
+@functools.lru_cache(maxsize=None)
+def resolve_executable(name):
+    """Absolute path of a program on PATH; also finds .cmd shims on Windows"""
+    return shutil.which(name) or name
+
+async def run_command(argv, description, quiet=False):
+    """Run a command without a shell and return result; quiet only reports success"""
+    if not quiet:
+        print(f"[INFO] {description}...")
+    proc = None
+    try:
+        proc = await asyncio.create_subprocess_exec(
+            resolve_executable(argv[0]),
+            *argv[1:],
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE
+        )
+        stdout = deque(maxlen=OUTPUT_TAIL_LINES)
+        stderr = deque(maxlen=OUTPUT_TAIL_LINES)
+        await asyncio.gather(_pump(proc.stdout, stdout, not quiet), _pump(proc.stderr, stderr, not quiet))
+        await proc.wait()
+        if proc.returncode == 0:
+            print(f"[SUCCESS] {description} completed")
+            return "\n".join(stdout).strip()
+        else:
+            if not quiet:
+                print(f"[ERROR] {description} failed: " + "\n".join(stderr))
+            return None
+    except Exception as e:
+        if not quiet:
+            print(f"[ERROR] {description} error: {e}")
+        return None
+    finally:
+        # Don't leave the child running if reading failed or we were cancelled
+        if proc is not None and proc.returncode is None:
+            proc.kill()
+            await proc.wait()
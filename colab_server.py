@@ -1,27 +1,21 @@
 # Colab Server for Interactive Feedback MCP
 # Modified server.py to work with web UI instead of desktop UI
 
-import os
-import sys
-import json
-import tempfile
-import subprocess
-
 from typing import Annotated, Dict
 
 from fastmcp import FastMCP
 from pydantic import Field
 
-# Import the Colab web UI
-from colab_web_ui import feedback_ui
-
 # The log_level is necessary for Cline to work: https://github.com/jlowin/fastmcp/issues/81
 mcp = FastMCP("Interactive Feedback MCP - Colab", log_level="ERROR")
 
 def launch_feedback_ui(project_directory: str, summary: str) -> dict[str, str]:
     """Launch the Colab web-based feedback UI"""
     try:
-        # Use the Colab web UI instead of desktop UI
+        # Use the Colab web UI instead of desktop UI. Imported here so the
+        # stdio server starts without loading FastAPI/uvicorn up front.
+        from colab_web_ui import feedback_ui
+
         result = feedback_ui(project_directory, summary)
         
         if result is None:
@@ -42,7 +36,7 @@ def launch_feedback_ui(project_directory: str, summary: str) -> dict[str, str]:
         }
 
 def first_line(text: str) -> str:
-    return text.split("\n")[0].strip()
+    return text.partition("\n")[0].strip()
 
 @mcp.tool()
 def interactive_feedback(
@@ -2,18 +2,28 @@
 # Simple web-based replacement for feedback_ui.py
 # Compatible with Google Colab environment
 
+import io
 import os
 import sys
-import json
+import asyncio
 import argparse
+import functools
+import hashlib
 import threading
-import time
+from dataclasses import dataclass, replace
 from typing import Optional, TypedDict
-from fastapi import FastAPI, Request, Form
-from fastapi.responses import HTMLResponse
+from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import HTMLResponse, ORJSONResponse, Response
 from fastapi.middleware.cors import CORSMiddleware
+from pydantic import BaseModel
+import orjson
 import uvicorn
 
+try:
+    import rjsmin
+except ImportError:  # optional; fall back to the line-based pass in _minify_js()
+    rjsmin = None
+
 class FeedbackResult(TypedDict):
     command_logs: str
     interactive_feedback: str
@@ -22,21 +32,43 @@ class FeedbackConfig(TypedDict):
     run_command: str
     execute_automatically: bool
 
+@dataclass(frozen=True, slots=True)
+class Session:
+    """Per-session inputs; swapped wholesale on app.state, never mutated"""
+    project_directory: str
+    prompt: str
+    config: FeedbackConfig
+
+class CommandRequest(BaseModel):
+    command: str = ""
+
+class FeedbackRequest(BaseModel):
+    feedback: str = ""
+
 # Global variables for feedback
 feedback_result: Optional[FeedbackResult] = None
-feedback_config: FeedbackConfig = {
-    "run_command": "",
-    "execute_automatically": False
-}
-current_project_directory = ""
-current_prompt = ""
-command_logs = []
+command_logs = io.StringIO()
+
+# Set once the server is accepting connections / once feedback is submitted
+server_ready = threading.Event()
+feedback_event = threading.Event()
+
+# Awaited by /get-result long-polls. feedback_ui runs outside the server loop,
+# so it swaps in a fresh event per session instead of clearing this one
+result_event = asyncio.Event()
+RESULT_POLL_TIMEOUT = 25.0
+SERVER_START_TIMEOUT = 10.0
+STATIC_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# One queue per connected /ws client; run_command/submit_feedback push into all
+_subscribers: set[asyncio.Queue] = set()
 
 # Create FastAPI app
 app = FastAPI(
     title="Interactive Feedback MCP - Colab Web UI",
     description="Web-based feedback UI for Google Colab",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -48,102 +80,274 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-@app.get("/", response_class=HTMLResponse)
-async def feedback_form():
-    """Main feedback form"""
-    return f"""
+app.state.session = Session(
+    project_directory="",
+    prompt="",
+    config={"run_command": "", "execute_automatically": False}
+)
+
+# Static assets; served with long-lived cache headers and versioned by ETag
+APP_CSS = """
+body {
+    font-family: Arial, sans-serif;
+    max-width: 800px;
+    margin: 0 auto;
+    padding: 20px;
+    background-color: #1e1e1e;
+    color: #ffffff;
+}
+.container {
+    background-color: #2d2d2d;
+    padding: 20px;
+    border-radius: 8px;
+    margin-bottom: 20px;
+}
+.prompt {
+    background-color: #3d3d3d;
+    padding: 15px;
+    border-radius: 5px;
+    margin-bottom: 20px;
+    border-left: 4px solid #42a5f5;
+}
+.command-section {
+    background-color: #3d3d3d;
+    padding: 15px;
+    border-radius: 5px;
+    margin-bottom: 20px;
+}
+.feedback-section {
+    background-color: #3d3d3d;
+    padding: 15px;
+    border-radius: 5px;
+    margin-bottom: 20px;
+}
+input[type="text"], textarea {
+    width: 100%;
+    padding: 10px;
+    border: 1px solid #555;
+    border-radius: 4px;
+    background-color: #404040;
+    color: #ffffff;
+    box-sizing: border-box;
+}
+textarea {
+    min-height: 120px;
+    resize: vertical;
+}
+button {
+    background-color: #42a5f5;
+    color: white;
+    padding: 10px 20px;
+    border: none;
+    border-radius: 4px;
+    cursor: pointer;
+    margin-right: 10px;
+    margin-bottom: 10px;
+}
+button:hover {
+    background-color: #1976d2;
+}
+.log-output {
+    background-color: #1a1a1a;
+    color: #00ff00;
+    padding: 10px;
+    border-radius: 4px;
+    font-family: monospace;
+    min-height: 200px;
+    white-space: pre-wrap;
+    overflow-y: auto;
+    max-height: 400px;
+}
+.hidden {
+    display: none;
+}
+.status {
+    padding: 10px;
+    border-radius: 4px;
+    margin-bottom: 10px;
+}
+.success {
+    background-color: #2e7d32;
+    color: white;
+}
+.info {
+    background-color: #1976d2;
+    color: white;
+}
+"""
+
+APP_JS = """
+let logsVisible = false;
+let commandRunning = false;
+let feedSocket = null;
+let feedOpened = false;
+let pendingOutput = '';
+
+function showStatus(message, type = 'info') {
+    const statusDiv = document.getElementById('status');
+    statusDiv.innerHTML = `<div class="status ${type}">${message}</div>`;
+}
+
+function toggleLogs() {
+    const logSection = document.getElementById('logSection');
+    logsVisible = !logsVisible;
+    logSection.classList.toggle('hidden');
+}
+
+function clearLogs() {
+    document.getElementById('logOutput').textContent = '';
+    showStatus('Logs cleared', 'info');
+}
+
+function appendLog(chunk) {
+    document.getElementById('logOutput').textContent += chunk;
+    if (!logsVisible) toggleLogs();
+}
+
+function connectFeed() {
+    const scheme = location.protocol === 'https:' ? 'wss' : 'ws';
+    feedSocket = new WebSocket(`${scheme}://${location.host}/ws`);
+    feedSocket.onopen = () => {
+        // The backlog sent on connect covers anything held back meanwhile
+        feedOpened = true;
+        pendingOutput = '';
+    };
+    feedSocket.onclose = () => {
+        // Never opened (e.g. websockets not installed): show what the POSTs returned
+        if (!feedOpened && pendingOutput) appendLog(pendingOutput);
+        pendingOutput = '';
+    };
+    feedSocket.onmessage = (event) => {
+        const message = JSON.parse(event.data);
+        if (message.type === 'log') appendLog(message.chunk);
+    };
+}
+
+async function runCommand() {
+    if (commandRunning) {
+        showStatus('Command is already running...', 'info');
+        return;
+    }
+
+    const command = document.getElementById('command').value;
+    if (!command) {
+        showStatus('Please enter a command', 'info');
+        return;
+    }
+
+    commandRunning = true;
+    showStatus('Running command...', 'info');
+
+    try {
+        const response = await fetch('/run-command', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({ command })
+        });
+
+        const result = await response.json();
+
+        if (result.success) {
+            showStatus('Command executed successfully', 'success');
+            // Output arrives over /ws: live once open, or in the backlog sent
+            // on connect while still connecting. Hold it until the socket
+            // settles in that case, and fall back only if it is down
+            if (feedSocket && feedSocket.readyState === WebSocket.CONNECTING) pendingOutput += result.output;
+            else if (!feedSocket || feedSocket.readyState > WebSocket.OPEN) appendLog(result.output);
+        } else {
+            showStatus('Command failed: ' + result.error, 'info');
+            document.getElementById('logOutput').textContent = result.error;
+            if (!logsVisible) toggleLogs();
+        }
+    } catch (error) {
+        showStatus('Error running command: ' + error.message, 'info');
+    } finally {
+        commandRunning = false;
+    }
+}
+
+async function submitFeedback() {
+    const feedback = document.getElementById('feedback').value;
+
+    try {
+        const response = await fetch('/submit-feedback', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({ feedback })
+        });
+
+        const result = await response.json();
+
+        if (result.success) {
+            showStatus('Feedback submitted successfully! Closing window...', 'success');
+            setTimeout(() => {
+                window.close();
+            }, 2000);
+        } else {
+            showStatus('Error submitting feedback: ' + result.error, 'info');
+        }
+    } catch (error) {
+        showStatus('Error submitting feedback: ' + error.message, 'info');
+    }
+}
+
+async function submitEmpty() {
+    try {
+        const response = await fetch('/submit-feedback', {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({ feedback: '' })
+        });
+
+        const result = await response.json();
+
+        if (result.success) {
+            showStatus('Empty feedback submitted. Closing window...', 'success');
+            setTimeout(() => {
+                window.close();
+            }, 2000);
+        } else {
+            showStatus('Error submitting feedback: ' + result.error, 'info');
+        }
+    } catch (error) {
+        showStatus('Error submitting feedback: ' + error.message, 'info');
+    }
+}
+
+connectFeed();
+"""
+
+def _etag(content: bytes) -> str:
+    """Strong ETag for a response body"""
+    return f'"{hashlib.blake2b(content, digest_size=16).hexdigest()}"'
+
+_app_css = APP_CSS.encode("utf-8")
+_app_css_etag = _etag(_app_css)
+def _minify_js(source: str) -> str:
+    """Strip comments and whitespace from the embedded script"""
+    if rjsmin is not None:
+        return rjsmin.jsmin(source)
+    # Drop indentation, blank lines and whole-line comments but keep line
+    # breaks so automatic semicolon insertion still sees the same statements
+    lines = (line.strip() for line in source.splitlines())
+    return "\n".join(line for line in lines if line and not line.startswith("//"))
+
+_app_js = _minify_js(APP_JS).encode("utf-8")
+_app_js_etag = _etag(_app_js)
+
+# Feedback form, rendered with str.format() by _render_html()
+HTML_TEMPLATE = """
     <!DOCTYPE html>
     <html>
     <head>
         <title>Interactive Feedback MCP - Colab</title>
-        <style>
-            body {{
-                font-family: Arial, sans-serif;
-                max-width: 800px;
-                margin: 0 auto;
-                padding: 20px;
-                background-color: #1e1e1e;
-                color: #ffffff;
-            }}
-            .container {{
-                background-color: #2d2d2d;
-                padding: 20px;
-                border-radius: 8px;
-                margin-bottom: 20px;
-            }}
-            .prompt {{
-                background-color: #3d3d3d;
-                padding: 15px;
-                border-radius: 5px;
-                margin-bottom: 20px;
-                border-left: 4px solid #42a5f5;
-            }}
-            .command-section {{
-                background-color: #3d3d3d;
-                padding: 15px;
-                border-radius: 5px;
-                margin-bottom: 20px;
-            }}
-            .feedback-section {{
-                background-color: #3d3d3d;
-                padding: 15px;
-                border-radius: 5px;
-                margin-bottom: 20px;
-            }}
-            input[type="text"], textarea {{
-                width: 100%;
-                padding: 10px;
-                border: 1px solid #555;
-                border-radius: 4px;
-                background-color: #404040;
-                color: #ffffff;
-                box-sizing: border-box;
-            }}
-            textarea {{
-                min-height: 120px;
-                resize: vertical;
-            }}
-            button {{
-                background-color: #42a5f5;
-                color: white;
-                padding: 10px 20px;
-                border: none;
-                border-radius: 4px;
-                cursor: pointer;
-                margin-right: 10px;
-                margin-bottom: 10px;
-            }}
-            button:hover {{
-                background-color: #1976d2;
-            }}
-            .log-output {{
-                background-color: #1a1a1a;
-                color: #00ff00;
-                padding: 10px;
-                border-radius: 4px;
-                font-family: monospace;
-                min-height: 200px;
-                white-space: pre-wrap;
-                overflow-y: auto;
-                max-height: 400px;
-            }}
-            .hidden {{
-                display: none;
-            }}
-            .status {{
-                padding: 10px;
-                border-radius: 4px;
-                margin-bottom: 10px;
-            }}
-            .success {{
-                background-color: #2e7d32;
-                color: white;
-            }}
-            .info {{
-                background-color: #1976d2;
-                color: white;
-            }}
-        </style>
+        <link rel="stylesheet" href="/static/app.css?v={css_version}">
     </head>
     <body>
         <div class="container">
@@ -151,16 +355,16 @@ async def feedback_form():
             
             <div class="prompt">
                 <h3>📝 Prompt:</h3>
-                <p>{current_prompt}</p>
+                <p>{prompt}</p>
             </div>
             
             <div class="command-section">
                 <h3>⚙️ Command Section</h3>
-                <p><strong>Working Directory:</strong> {current_project_directory}</p>
+                <p><strong>Working Directory:</strong> {project_directory}</p>
                 
                 <form id="commandForm">
                     <label for="command">Command to run:</label>
-                    <input type="text" id="command" name="command" placeholder="Enter command here..." value="{feedback_config['run_command']}">
+                    <input type="text" id="command" name="command" placeholder="Enter command here..." value="{run_command}">
                     <br><br>
                     
                     <button type="button" onclick="runCommand()">▶️ Run Command</button>
@@ -169,7 +373,7 @@ async def feedback_form():
                     <br><br>
                     
                     <label>
-                        <input type="checkbox" id="autoExecute" {'checked' if feedback_config['execute_automatically'] else ''}> 
+                        <input type="checkbox" id="autoExecute" {auto_checked}> 
                         Execute automatically on next run
                     </label>
                 </form>
@@ -195,229 +399,250 @@ async def feedback_form():
             <div id="status"></div>
         </div>
         
+        <script src="/static/app.js?v={js_version}"></script>
         <script>
-            let logsVisible = false;
-            let commandRunning = false;
-            
-            function showStatus(message, type = 'info') {{
-                const statusDiv = document.getElementById('status');
-                statusDiv.innerHTML = `<div class="status ${{type}}">${{message}}</div>`;
-            }}
-            
-            function toggleLogs() {{
-                const logSection = document.getElementById('logSection');
-                logsVisible = !logsVisible;
-                logSection.classList.toggle('hidden');
-            }}
-            
-            function clearLogs() {{
-                document.getElementById('logOutput').textContent = '';
-                showStatus('Logs cleared', 'info');
-            }}
-            
-            async function runCommand() {{
-                if (commandRunning) {{
-                    showStatus('Command is already running...', 'info');
-                    return;
-                }}
-                
-                const command = document.getElementById('command').value;
-                if (!command) {{
-                    showStatus('Please enter a command', 'info');
-                    return;
-                }}
-                
-                commandRunning = true;
-                showStatus('Running command...', 'info');
-                
-                try {{
-                    const response = await fetch('/run-command', {{
-                        method: 'POST',
-                        headers: {{
-                            'Content-Type': 'application/x-www-form-urlencoded',
-                        }},
-                        body: `command=${{encodeURIComponent(command)}}`
-                    }});
-                    
-                    const result = await response.json();
-                    
-                    if (result.success) {{
-                        showStatus('Command executed successfully', 'success');
-                        document.getElementById('logOutput').textContent = result.output;
-                        if (!logsVisible) toggleLogs();
-                    }} else {{
-                        showStatus('Command failed: ' + result.error, 'info');
-                        document.getElementById('logOutput').textContent = result.error;
-                        if (!logsVisible) toggleLogs();
-                    }}
-                }} catch (error) {{
-                    showStatus('Error running command: ' + error.message, 'info');
-                }} finally {{
-                    commandRunning = false;
-                }}
-            }}
-            
-            async function submitFeedback() {{
-                const feedback = document.getElementById('feedback').value;
-                
-                try {{
-                    const response = await fetch('/submit-feedback', {{
-                        method: 'POST',
-                        headers: {{
-                            'Content-Type': 'application/x-www-form-urlencoded',
-                        }},
-                        body: `feedback=${{encodeURIComponent(feedback)}}`
-                    }});
-                    
-                    const result = await response.json();
-                    
-                    if (result.success) {{
-                        showStatus('Feedback submitted successfully! Closing window...', 'success');
-                        setTimeout(() => {{
-                            window.close();
-                        }}, 2000);
-                    }} else {{
-                        showStatus('Error submitting feedback: ' + result.error, 'info');
-                    }}
-                }} catch (error) {{
-                    showStatus('Error submitting feedback: ' + error.message, 'info');
-                }}
-            }}
-            
-            async function submitEmpty() {{
-                try {{
-                    const response = await fetch('/submit-feedback', {{
-                        method: 'POST',
-                        headers: {{
-                            'Content-Type': 'application/x-www-form-urlencoded',
-                        }},
-                        body: 'feedback='
-                    }});
-                    
-                    const result = await response.json();
-                    
-                    if (result.success) {{
-                        showStatus('Empty feedback submitted. Closing window...', 'success');
-                        setTimeout(() => {{
-                            window.close();
-                        }}, 2000);
-                    }} else {{
-                        showStatus('Error submitting feedback: ' + result.error, 'info');
-                    }}
-                }} catch (error) {{
-                    showStatus('Error submitting feedback: ' + error.message, 'info');
-                }}
-            }}
-            
             // Auto-execute if configured
-            {f"runCommand();" if feedback_config['execute_automatically'] and feedback_config['run_command'] else ""}
+            {auto_run}
         </script>
     </body>
     </html>
     """
 
+# Rendered form and its ETag, rebuilt by _render_html() when the session changes
+_cached_html = b""
+_cached_html_etag = ""
+
+@functools.lru_cache(maxsize=32)
+def _build_html(prompt: str, project_directory: str, run_command: str, auto: bool) -> bytes:
+    """Render the feedback form; pure, so repeat sessions reuse the same bytes"""
+    return HTML_TEMPLATE.format(
+        prompt=prompt,
+        project_directory=project_directory,
+        run_command=run_command,
+        auto_checked="checked" if auto else "",
+        auto_run="runCommand();" if auto and run_command else "",
+        css_version=_app_css_etag.strip('"')[:8],
+        js_version=_app_js_etag.strip('"')[:8]
+    ).encode("utf-8")
+
+def _render_html(session: Session):
+    """Make the feedback form for a session the one served at /"""
+    global _cached_html, _cached_html_etag
+    _cached_html = _build_html(
+        session.prompt,
+        session.project_directory,
+        session.config["run_command"],
+        session.config["execute_automatically"]
+    )
+    _cached_html_etag = _etag(_cached_html)
+
+_render_html(app.state.session)
+
+def _cached_response(request: Request, content: bytes, etag: str, media_type: str, cache_control: str) -> Response:
+    """Return content, or an empty 304 if the client already holds this ETag"""
+    headers = {"Cache-Control": cache_control, "ETag": etag}
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+    return Response(content, media_type=media_type, headers=headers)
+
+@app.get("/", response_class=HTMLResponse)
+async def feedback_form(request: Request):
+    """Main feedback form"""
+    return _cached_response(request, _cached_html, _cached_html_etag, "text/html; charset=utf-8", "no-cache")
+
+@app.get("/static/app.css")
+async def app_css(request: Request):
+    """Stylesheet for the feedback form"""
+    return _cached_response(request, _app_css, _app_css_etag, "text/css; charset=utf-8", STATIC_CACHE_CONTROL)
+
+@app.get("/static/app.js")
+async def app_js(request: Request):
+    """Script for the feedback form"""
+    return _cached_response(request, _app_js, _app_js_etag, "application/javascript; charset=utf-8", STATIC_CACHE_CONTROL)
+
 @app.post("/run-command")
-async def run_command(request: Request):
+async def run_command(body: CommandRequest, request: Request):
     """Run a command and return output"""
     try:
-        form = await request.form()
-        command = form.get("command", "")
+        command = body.command
         
         if not command:
-            return {"success": False, "error": "No command provided"}
+            return ORJSONResponse({"success": False, "error": "No command provided"})
         
-        # Update config
-        feedback_config["run_command"] = command
+        # Update config, re-rendering the form so a reload shows the new command
+        session = request.app.state.session
+        if command != session.config["run_command"]:
+            session = replace(session, config={**session.config, "run_command": command})
+            request.app.state.session = session
+            _render_html(session)
         
         # Simulate command execution (in real implementation, you'd use subprocess)
         # For Colab, we'll just return a mock output
         output = f"$ {command}\n"
-        output += f"Command executed in: {current_project_directory}\n"
+        output += f"Command executed in: {session.project_directory}\n"
         output += "Note: This is a mock execution in Colab environment.\n"
         output += "In real deployment, actual command execution would happen here.\n"
         
         # Store logs
-        command_logs.append(output)
+        command_logs.write(output)
+        _broadcast({"type": "log", "chunk": output})
         
-        return {
+        return ORJSONResponse({
             "success": True,
             "output": output
-        }
+        })
         
     except Exception as e:
-        return {
+        return ORJSONResponse({
             "success": False,
             "error": str(e)
-        }
+        })
 
 @app.post("/submit-feedback")
-async def submit_feedback(request: Request):
+async def submit_feedback(body: FeedbackRequest):
     """Submit feedback"""
     try:
-        form = await request.form()
-        feedback = form.get("feedback", "")
+        feedback = body.feedback
         
         # Store the result
         global feedback_result
         feedback_result = FeedbackResult(
-            logs="".join(command_logs),
+            logs=command_logs.getvalue(),
             interactive_feedback=feedback
         )
+        feedback_event.set()
+        result_event.set()
+        _broadcast({"type": "result", "result": feedback_result})
         
-        return {
+        return ORJSONResponse({
             "success": True,
             "message": "Feedback submitted successfully"
-        }
+        })
         
     except Exception as e:
-        return {
+        return ORJSONResponse({
             "success": False,
             "error": str(e)
-        }
+        })
 
 @app.get("/get-result")
-async def get_result():
-    """Get the feedback result (for external polling)"""
-    return {
+async def get_result(timeout: float = RESULT_POLL_TIMEOUT):
+    """Get the feedback result, waiting up to `timeout` seconds for it (long-poll)"""
+    if feedback_result is None and timeout > 0:
+        try:
+            await asyncio.wait_for(result_event.wait(), timeout=min(timeout, RESULT_POLL_TIMEOUT))
+        except asyncio.TimeoutError:
+            pass
+    return ORJSONResponse({
         "result": feedback_result,
         "ready": feedback_result is not None
-    }
+    })
+
+def _broadcast(message: dict):
+    """Queue a message for every connected /ws client"""
+    for queue in _subscribers:
+        queue.put_nowait(message)
+
+@app.websocket("/ws")
+async def feed(websocket: WebSocket):
+    """Push command output and the feedback result as they happen
+
+    Frames are {"type": "log", "chunk": str} and {"type": "result", "result": ...}.
+    Anything logged before the client connected is sent first.
+    """
+    await websocket.accept()
+    queue: asyncio.Queue = asyncio.Queue()
+    logs = command_logs.getvalue()
+    if logs:
+        queue.put_nowait({"type": "log", "chunk": logs})
+    if feedback_result is not None:
+        queue.put_nowait({"type": "result", "result": feedback_result})
+    _subscribers.add(queue)
+
+    async def pump():
+        while True:
+            await websocket.send_text(orjson.dumps(await queue.get()).decode())
+
+    sender = asyncio.create_task(pump())
+    try:
+        # Client messages are ignored; receiving is how a disconnect is noticed
+        while True:
+            await websocket.receive_text()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        _subscribers.discard(queue)
+        # Collect the sender's outcome so a failed send_text isn't left unretrieved
+        await asyncio.gather(sender, return_exceptions=True)
+
+class FeedbackServer(uvicorn.Server):
+    """uvicorn server that signals server_ready once startup has finished"""
+
+    async def startup(self, sockets=None):
+        try:
+            await super().startup(sockets=sockets)
+        finally:
+            # Also set on failure (port in use exits here) so the caller
+            # doesn't sit out the whole timeout
+            server_ready.set()
 
 def feedback_ui(project_directory: str, prompt: str, output_file: Optional[str] = None) -> Optional[FeedbackResult]:
     """Main function to run the feedback UI"""
-    global current_project_directory, current_prompt, feedback_result, command_logs
+    global feedback_result, command_logs, result_event
     
-    # Reset state
-    current_project_directory = project_directory
-    current_prompt = prompt
+    # Reset state, keeping the command config from any previous session
+    session = Session(
+        project_directory=project_directory,
+        prompt=prompt,
+        config=app.state.session.config
+    )
+    app.state.session = session
     feedback_result = None
-    command_logs = []
+    command_logs = io.StringIO()
+    feedback_event.clear()
+    result_event = asyncio.Event()
+    _render_html(session)
+    
+    server_ready.clear()
     
     # Start the web server
-    def run_server():
-        uvicorn.run(app, host="0.0.0.0", port=8080, log_level="error")
+    config = uvicorn.Config(
+        app,
+        host="0.0.0.0",
+        port=8080,
+        log_level="error",
+        access_log=False
+    )
+    server = FeedbackServer(config)
     
     # Start server in background
-    server_thread = threading.Thread(target=run_server, daemon=True)
+    server_thread = threading.Thread(target=server.run, daemon=True)
     server_thread.start()
     
-    # Wait for server to start
-    time.sleep(2)
+    # Wait for server to start; server.started is only set once uvicorn is
+    # listening, so a failed start (port in use) leaves it False
+    if not server_ready.wait(SERVER_START_TIMEOUT) or not server.started or not server_thread.is_alive():
+        server.should_exit = True
+        raise RuntimeError("Feedback UI server failed to start on port 8080")
     
     print(f"🌐 Feedback UI started at: http://localhost:8080")
     print(f"📁 Project: {project_directory}")
     print(f"💬 Prompt: {prompt}")
     print(f"⏳ Waiting for feedback...")
     
-    # Poll for result
-    while feedback_result is None:
-        time.sleep(1)
+    # Block until /submit-feedback delivers a result
+    feedback_event.wait()
+    
+    # Shut the server down so the next call can bind the port again
+    server.should_exit = True
+    server_thread.join(timeout=5)
     
     # Save result if output file specified
     if output_file and feedback_result:
         os.makedirs(os.path.dirname(output_file) if os.path.dirname(output_file) else ".", exist_ok=True)
-        with open(output_file, "w") as f:
-            json.dump(feedback_result, f)
+        with open(output_file, "wb") as f:
+            f.write(orjson.dumps(feedback_result))
         return None
     
     return feedback_result
@@ -3,97 +3,154 @@
 Deploy Interactive Feedback MCP Server to Online Platform
 """
 
-import subprocess
-import json
-import os
-import time
-
-def run_command(command, description):
-    """Run a command and return result"""
-    print(f"[INFO] {description}...")
-    try:
-        result = subprocess.run(command, shell=True, capture_output=True, text=True)
-        if result.returncode == 0:
-            print(f"[SUCCESS] {description} completed")
-            return result.stdout.strip()
-        else:
-            print(f"[ERROR] {description} failed: {result.stderr}")
-            return None
-    except Exception as e:
-        print(f"[ERROR] {description} error: {e}")
-        return None
+import argparse
+import asyncio
+import sys
+
+from _deploy_common import ONLINE_MCP_JSON, run_command
+
+# Version probes already started this run, keyed by argv
+_version_probes = {}
+
+# Railway CLI install command for each Node.js package manager we can use
+_INSTALL_RAILWAY_CLI = {
+    "npm": ["npm", "install", "-g", "@railway/cli"],
+    "yarn": ["yarn", "global", "add", "@railway/cli"],
+    "pnpm": ["pnpm", "add", "-g", "@railway/cli"],
+}
+
+# Railway pipeline run once the CLI is available
+_RAILWAY_STEPS = [
+    ("Logging into Railway", ["railway", "login"], True),
+    ("Initializing Railway project", ["railway", "init"], True),
+    ("Deploying to Railway", ["railway", "up"], True),
+]
+
+# Menu numbers offered by main() and the deployment target each selects
+_TARGET_CHOICES = {"1": "railway", "2": "render", "3": "heroku"}
+
+_NEXT_STEPS = """[SUCCESS] Online MCP configuration created: mcp_online.json
+
+Next steps:
+1. Check Railway dashboard for your deployment URL
+2. Update mcp_online.json with your actual URL
+3. Copy configuration to Cursor settings
+4. Restart Cursor
+"""
 
-def check_railway_cli():
+_RENDER_HELP = """
+Deploy to Render (Alternative):
+1. Go to https://render.com
+2. Sign up/Login with GitHub
+3. Click 'New +' → 'Web Service'
+4. Connect GitHub repo: phamdanguyen/interactive-feedback-mcp
+5. Configure:
+   - Build Command: pip install fastapi "uvicorn[standard]" orjson
+   - Start Command: python railway_server.py
+   - Environment: Python 3
+6. Deploy
+"""
+
+_HEROKU_HELP = """
+Heroku Deployment:
+1. Install Heroku CLI
+2. heroku login
+3. heroku create your-app-name
+4. git push heroku main
+"""
+
+async def probe_version(argv, description, quiet=False):
+    """Run a version check once per run; later callers share its result"""
+    key = tuple(argv)
+    if key not in _version_probes or _version_probes[key].cancelled():
+        _version_probes[key] = asyncio.ensure_future(run_command(argv, description, quiet))
+    return await _version_probes[key]
+
+async def check_railway_cli():
     """Check if Railway CLI is installed"""
     print("Checking Railway CLI...")
-    result = run_command("railway --version", "Checking Railway CLI")
+    result = await probe_version(["railway", "--version"], "Checking Railway CLI")
+    return result is not None
+
+async def check_npm():
+    """Check if npm is installed"""
+    result = await probe_version(["npm", "--version"], "Checking npm", quiet=True)
     return result is not None
 
-def install_railway_cli():
+async def find_package_manager():
+    """Race the package manager probes and return the first one installed"""
+    # Quiet, since missing or cancelled managers are expected here
+    probes = {
+        asyncio.ensure_future(probe_version([name, "--version"], f"Checking {name}", quiet=True)): name
+        for name in _INSTALL_RAILWAY_CLI
+    }
+    pending = set(probes)
+    found = None
+    while pending and found is None:
+        done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        found = next((probes[task] for task in done if task.result() is not None), None)
+    for task in pending:
+        task.cancel()
+    return found
+
+async def install_railway_cli():
     """Install Railway CLI"""
     print("Installing Railway CLI...")
     
-    # Check if npm is available
-    npm_check = run_command("npm --version", "Checking npm")
-    if not npm_check:
-        print("[ERROR] npm not found. Please install Node.js first.")
+    # Use whichever package manager answers first
+    manager = await find_package_manager()
+    if manager is None:
+        print("[ERROR] No Node.js package manager (npm, yarn or pnpm) found. Please install Node.js first.")
         print("Download from: https://nodejs.org/")
         return False
     
     # Install Railway CLI
-    result = run_command("npm install -g @railway/cli", "Installing Railway CLI")
+    result = await run_command(_INSTALL_RAILWAY_CLI[manager], f"Installing Railway CLI with {manager}")
     return result is not None
 
-def deploy_to_railway():
+async def run_pipeline(steps):
+    """Run (description, argv, required) steps in order; stop at the first required failure"""
+    for description, argv, required in steps:
+        print(f"\n{description}...")
+        if await run_command(argv, description) is None and required:
+            return False
+    return True
+
+async def deploy_to_railway():
     """Deploy to Railway"""
     print("\nDeploying to Railway...")
     
-    # Check if Railway CLI is installed
-    if not check_railway_cli():
+    # Check if Railway CLI and npm are installed; the probes are independent
+    railway_ok, _ = await asyncio.gather(check_railway_cli(), check_npm())
+    if not railway_ok:
         print("Railway CLI not found. Installing...")
-        if not install_railway_cli():
+        if not await install_railway_cli():
             print("[ERROR] Failed to install Railway CLI")
             return False
     
-    # Login to Railway
-    print("\nPlease login to Railway...")
-    print("This will open a browser window for authentication.")
-    login_result = run_command("railway login", "Logging into Railway")
-    
-    if not login_result:
-        print("[ERROR] Railway login failed")
-        return False
-    
-    # Initialize Railway project
-    print("\nInitializing Railway project...")
-    init_result = run_command("railway init", "Initializing Railway project")
-    
-    if not init_result:
-        print("[ERROR] Railway initialization failed")
-        return False
-    
-    # Deploy to Railway
-    print("\nDeploying to Railway...")
-    deploy_result = run_command("railway up", "Deploying to Railway")
-    
-    if deploy_result:
+    # Login, initialize the project and deploy
+    print("\nRailway login will open a browser window for authentication.")
+    if await run_pipeline(_RAILWAY_STEPS):
         print("[SUCCESS] Deployment to Railway completed!")
         
-        # Get deployment URL
+        # Get deployment URL while the MCP config template is written
         print("\nGetting deployment URL...")
-        status_result = run_command("railway status", "Getting Railway status")
+        status_result, _ = await asyncio.gather(
+            run_command(["railway", "status"], "Getting Railway status"),
+            asyncio.to_thread(create_online_mcp_config)
+        )
         
         if status_result:
             print("[SUCCESS] Deployment successful!")
             print(f"Status: {status_result}")
-            
-            # Create updated MCP config
-            create_online_mcp_config()
-            
-            return True
+            print("\nTest the deployment:")
+            print("   curl https://your-railway-url.com/health")
+            print("   curl -X POST https://your-railway-url.com/api/interactive-feedback \\")
+            print("     -H 'Content-Type: application/json' \\")
+            print("     -d '{\"project_directory\": \"/test\", \"summary\": \"Test feedback\"}'")
         else:
-            print("[WARNING] Could not get deployment status")
-            return True  # Still consider successful if deploy worked
+            print("[WARNING] Could not get deployment status. Check Railway dashboard.")
+        return True  # Still consider successful if deploy worked
     else:
         print("[ERROR] Railway deployment failed")
         return False
@@ -102,61 +159,30 @@ def create_online_mcp_config():
     """Create MCP config for online deployment"""
     print("\nCreating online MCP configuration...")
     
-    # For now, create a template that user can update with actual URL
-    config = {
-        "mcpServers": {
-            "interactive-feedback-mcp-online": {
-                "command": "curl",
-                "args": [
-                    "-X", "POST",
-                    "https://YOUR-RAILWAY-URL.up.railway.app/api/interactive-feedback",
-                    "-H", "Content-Type: application/json",
-                    "-d", "@-"
-                ],
-                "timeout": 600,
-                "autoApprove": [
-                    "interactive_feedback"
-                ]
-            }
-        }
-    }
-    
     with open("mcp_online.json", "w") as f:
-        json.dump(config, f, indent=2)
+        f.write(ONLINE_MCP_JSON)
     
-    print("[SUCCESS] Online MCP configuration created: mcp_online.json")
-    print("\nNext steps:")
-    print("1. Check Railway dashboard for your deployment URL")
-    print("2. Update mcp_online.json with your actual URL")
-    print("3. Copy configuration to Cursor settings")
-    print("4. Restart Cursor")
+    sys.stdout.write(_NEXT_STEPS)
 
 def deploy_to_render():
     """Deploy to Render (alternative)"""
-    print("\nDeploy to Render (Alternative):")
-    print("1. Go to https://render.com")
-    print("2. Sign up/Login with GitHub")
-    print("3. Click 'New +' → 'Web Service'")
-    print("4. Connect GitHub repo: phamdanguyen/interactive-feedback-mcp")
-    print("5. Configure:")
-    print("   - Build Command: pip install fastapi uvicorn")
-    print("   - Start Command: python railway_server.py")
-    print("   - Environment: Python 3")
-    print("6. Deploy")
-
-def main():
+    sys.stdout.write(_RENDER_HELP)
+
+async def main(target=None):
     print("Deploy Interactive Feedback MCP Server Online")
     print("=" * 60)
     
-    print("\nDeployment Options:")
-    print("1. Railway (Automated)")
-    print("2. Render (Manual)")
-    print("3. Heroku (Manual)")
-    
-    choice = input("\nChoose deployment option (1-3): ").strip()
+    if target is None:
+        print("\nDeployment Options:")
+        print("1. Railway (Automated)")
+        print("2. Render (Manual)")
+        print("3. Heroku (Manual)")
+        
+        choice = input("\nChoose deployment option (1-3): ").strip()
+        target = _TARGET_CHOICES.get(choice)
     
-    if choice == "1":
-        success = deploy_to_railway()
+    if target == "railway":
+        success = await deploy_to_railway()
         if success:
             print("\n[SUCCESS] Railway deployment completed!")
             print("Check Railway dashboard for your URL and update mcp_online.json")
@@ -165,18 +191,20 @@ def main():
             print("Try Render deployment instead")
             deploy_to_render()
     
-    elif choice == "2":
+    elif target == "render":
         deploy_to_render()
     
-    elif choice == "3":
-        print("\nHeroku Deployment:")
-        print("1. Install Heroku CLI")
-        print("2. heroku login")
-        print("3. heroku create your-app-name")
-        print("4. git push heroku main")
+    elif target == "heroku":
+        sys.stdout.write(_HEROKU_HELP)
     
     else:
         print("Invalid choice. Please run again and choose 1-3.")
 
 if __name__ == "__main__":
-    main()
+    parser = argparse.ArgumentParser(description="Deploy the Interactive Feedback MCP server online")
+    parser.add_argument("--target", choices=list(_TARGET_CHOICES.values()), help="Deployment target; prompts when omitted")
+    args = parser.parse_args()
+    # Only prompt when someone is there to answer; CI passes --target
+    if args.target is None and not sys.stdin.isatty():
+        parser.error("--target is required when stdin is not a terminal")
+    asyncio.run(main(args.target))
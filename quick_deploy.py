@@ -33,7 +33,7 @@ def main():
     
     # Step 1: Install dependencies
     print("\n[STEP 1] Installing dependencies...")
-    run_command("pip install fastapi uvicorn", "Installing FastAPI and Uvicorn")
+    run_command("pip install fastapi \"uvicorn[standard]\" orjson", "Installing FastAPI, Uvicorn and orjson")
     
     # Step 2: Test server import
     print("\n[STEP 2] Testing server import...")
@@ -75,7 +75,7 @@ def main():
     print("   - Go to: https://render.com")
     print("   - Connect GitHub: phamdanguyen/interactive-feedback-mcp")
     print("   - Create Web Service")
-    print("   - Build Command: pip install fastapi uvicorn")
+    print("   - Build Command: pip install fastapi \"uvicorn[standard]\" orjson")
     print("   - Start Command: python railway_server.py")
     
     print("\n3. Heroku (Free tier discontinued, but still works):")
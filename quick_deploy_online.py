@@ -27,7 +27,7 @@ def open_render():
     print("2. Click 'New +' → 'Web Service'")
     print("3. Connect: phamdanguyen/interactive-feedback-mcp")
     print("4. Configure:")
-    print("   - Build Command: pip install fastapi uvicorn")
+    print("   - Build Command: pip install fastapi \"uvicorn[standard]\" orjson")
     print("   - Start Command: python railway_server.py")
     print("5. Deploy and copy URL")
 
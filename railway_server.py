@@ -4,13 +4,17 @@ Simple Interactive Feedback MCP Server for Railway deployment
 """
 
 from fastapi import FastAPI, HTTPException
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 import os
 import json
 import time
 
-app = FastAPI(title="Interactive Feedback MCP Server")
+app = FastAPI(
+    title="Interactive Feedback MCP Server",
+    default_response_class=ORJSONResponse
+)
 
 # Add CORS
 app.add_middleware(
@@ -60,4 +64,13 @@ def interactive_feedback(request: dict):
 
 if __name__ == "__main__":
     port = int(os.getenv("PORT", 8000))
-    uvicorn.run(app, host="0.0.0.0", port=port)
+    # Handlers are stateless, so WEB_CONCURRENCY can scale them across
+    # worker processes; one by default to fit small container plans
+    workers = int(os.getenv("WEB_CONCURRENCY", 1))
+    uvicorn.run(
+        "railway_server:app",
+        host="0.0.0.0",
+        port=port,
+        workers=workers,
+        log_level="warning"
+    )
@@ -4,8 +4,8 @@
 import os
 import sys
 import json
+import asyncio
 import tempfile
-import subprocess
 
 from typing import Annotated, Dict
 
@@ -15,17 +15,19 @@ from pydantic import Field
 # The log_level is necessary for Cline to work: https://github.com/jlowin/fastmcp/issues/81
 mcp = FastMCP("Interactive Feedback MCP", log_level="ERROR")
 
-def launch_feedback_ui(project_directory: str, summary: str) -> dict[str, str]:
+async def launch_feedback_ui(project_directory: str, summary: str) -> dict[str, str]:
     # Create a temporary file for the feedback result
     with tempfile.NamedTemporaryFile(suffix=".json", delete=False) as tmp:
         output_file = tmp.name
 
+    process = None
     try:
         # Get the path to feedback_ui.py relative to this script
         script_dir = os.path.dirname(os.path.abspath(__file__))
         feedback_ui_path = os.path.join(script_dir, "feedback_ui.py")
 
-        # Run feedback_ui.py as a separate process
+        # Run feedback_ui.py as a separate process; awaiting it keeps the
+        # server's event loop free while the window is open
         # NOTE: There appears to be a bug in uv, so we need
         # to pass a bunch of special flags to make this work
         args = [
@@ -36,38 +38,38 @@ def launch_feedback_ui(project_directory: str, summary: str) -> dict[str, str]:
             "--prompt", summary,
             "--output-file", output_file
         ]
-        result = subprocess.run(
-            args,
-            check=False,
-            shell=False,
-            stdout=subprocess.DEVNULL,
-            stderr=subprocess.DEVNULL,
-            stdin=subprocess.DEVNULL,
+        process = await asyncio.create_subprocess_exec(
+            *args,
+            stdout=asyncio.subprocess.DEVNULL,
+            stderr=asyncio.subprocess.DEVNULL,
+            stdin=asyncio.subprocess.DEVNULL,
             close_fds=True
         )
-        if result.returncode != 0:
-            raise Exception(f"Failed to launch feedback UI: {result.returncode}")
+        returncode = await process.wait()
+        if returncode != 0:
+            raise Exception(f"Failed to launch feedback UI: {returncode}")
 
         # Read the result from the temporary file
         with open(output_file, 'r') as f:
-            result = json.load(f)
-        os.unlink(output_file)
-        return result
-    except Exception as e:
+            return json.load(f)
+    finally:
+        # Also runs when the tool call is cancelled: close the window too
+        if process is not None and process.returncode is None:
+            process.kill()
+            await process.wait()
         if os.path.exists(output_file):
             os.unlink(output_file)
-        raise e
 
 def first_line(text: str) -> str:
-    return text.split("\n")[0].strip()
+    return text.partition("\n")[0].strip()
 
 @mcp.tool()
-def interactive_feedback(
+async def interactive_feedback(
     project_directory: Annotated[str, Field(description="Full path to the project directory")],
     summary: Annotated[str, Field(description="Short, one-line summary of the changes")],
 ) -> Dict[str, str]:
     """Request interactive feedback for a given project directory and summary"""
-    return launch_feedback_ui(first_line(project_directory), first_line(summary))
+    return await launch_feedback_ui(first_line(project_directory), first_line(summary))
 
 if __name__ == "__main__":
     mcp.run(transport="stdio")
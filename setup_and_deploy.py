@@ -50,7 +50,7 @@ def main():
     
     # Step 1: Install dependencies
     print("\n📦 Step 1: Installing dependencies...")
-    run_command("pip install fastapi uvicorn", "Installing FastAPI and Uvicorn")
+    run_command("pip install fastapi \"uvicorn[standard]\" orjson", "Installing FastAPI, Uvicorn and orjson")
     
     # Step 2: Test server locally
     print("\n🧪 Step 2: Testing server locally...")
@@ -107,7 +107,7 @@ def main():
     print("2. Connect your GitHub repository")
     print("3. Create new Web Service")
     print("4. Configure:")
-    print("   - Build Command: pip install fastapi uvicorn")
+    print("   - Build Command: pip install fastapi \"uvicorn[standard]\" orjson")
     print("   - Start Command: python railway_server.py")
     print("   - Environment: Python 3")
     
@@ -14,7 +14,7 @@ import subprocess
 from typing import Any, Dict, Optional
 
 from fastapi import FastAPI, HTTPException
-from fastapi.responses import JSONResponse
+from fastapi.responses import ORJSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 import uvicorn
 
@@ -25,12 +25,14 @@ logger = logging.getLogger(__name__)
 # Server configuration
 HOST = os.getenv("HOST", "0.0.0.0")
 PORT = int(os.getenv("PORT", 8000))
+WORKERS = int(os.getenv("WEB_CONCURRENCY", 1))
 
 # Create FastAPI app
 app = FastAPI(
     title="Interactive Feedback MCP Server",
     description="Web-deployable version of Interactive Feedback MCP for AI development tools",
-    version="1.0.0"
+    version="1.0.0",
+    default_response_class=ORJSONResponse
 )
 
 # Add CORS middleware
@@ -44,7 +46,7 @@ app.add_middleware(
 
 def first_line(text: str) -> str:
     """Get first line of text"""
-    return text.split("\n")[0].strip()
+    return text.partition("\n")[0].strip()
 
 def launch_feedback_ui(project_directory: str, summary: str) -> dict[str, str]:
     """Launch feedback UI and return result"""
@@ -145,7 +147,7 @@ async def api_interactive_feedback(request: dict):
             }
         }
         
-        return JSONResponse(content=result)
+        return ORJSONResponse(content=result)
         
     except Exception as e:
         logger.error(f"Error handling interactive feedback: {e}")
@@ -172,4 +174,10 @@ async def get_interactive_feedback_info():
 
 if __name__ == "__main__":
     logger.info(f"Starting Interactive Feedback MCP Server on {HOST}:{PORT}")
-    uvicorn.run(app, host=HOST, port=PORT, log_level="info")
+    uvicorn.run(
+        "web_server:app",
+        host=HOST,
+        port=PORT,
+        workers=WORKERS,
+        log_level="warning"
+    )